@@ -1,18 +1,30 @@
 import argparse
+import asyncio
 import uuid
 import config
 import time
 import os
 import datetime
 import logging
+from functools import lru_cache
+from dataclasses import dataclass, field
+from decimal import Decimal
 from logging import StreamHandler, FileHandler
-from tinkoff.invest import Client, MoneyValue, OrderType, OrderDirection
+from tinkoff.invest import AioRequestError, AsyncClient, Bond, InstrumentIdType, MoneyValue, OrderType, OrderDirection
+from tinkoff.invest.async_services import AsyncServices
 
 # Параметры
 TOKEN = config.TOKEN  # Токен для доступа к API
 DEFAULT_DISCOUNT = 3  # Дефолтная скидка в процентах
+ORDER_RATE_LIMIT = 5  # Максимум торговых поручений (выставление/отмена заявок) в секунду
+ORDER_BURST = 5  # Сколько поручений можно отправить подряд без ожидания
+PRICE_POLL_ATTEMPTS = 5  # Количество попыток получить фактическую цену покупки
+PRICE_POLL_INITIAL_DELAY = 0.2  # Первая пауза между попытками в секундах, далее удваивается
+
+INSTRUMENT_TYPES = ("share", "etf", "bond")  # Поддерживаемые типы инструментов в порядке приоритета при поиске
 
 SEPARATOR = "---------------------------------------"
+_DOT_TO_COMMA = str.maketrans(".", ",")  # Таблица замены точки на запятую в суммах
 LOG_DIR = "logs"
 
 # Список ценных бумаг и параметры заявок
@@ -33,114 +45,241 @@ SHARES = {
 
 
 # === Настройка логирования ===
-script_dir = os.path.dirname(os.path.abspath(__file__))
-log_dir = os.path.join(script_dir, LOG_DIR)
-os.makedirs(log_dir, exist_ok=True)
+logger = logging.getLogger("my_script_logger")
+
+def configure_logging():
+    """
+    Создает каталог логов и подключает обработчики для файла и консоли.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    log_dir = os.path.join(script_dir, LOG_DIR)
+    os.makedirs(log_dir, exist_ok=True)
 
-timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-log_file = os.path.join(log_dir, f"log_{timestamp}.log")
+    timestamp = datetime.datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+    log_file = os.path.join(log_dir, f"log_{timestamp}.log")
 
-# Создание логгера
-logger = logging.getLogger("my_script_logger")
-logger.setLevel(logging.INFO)
-logger.propagate = False
-
-# Формат вывода
-file_formatter = logging.Formatter(
-    '[%(asctime)s.%(msecs)03d] %(levelname)s: %(message)s',
-    datefmt='%H:%M:%S'
-)
-
-# Обработчик для файла
-file_handler = FileHandler(log_file, encoding='utf-8')
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-
-# Обработчик для консоли
-console_handler = StreamHandler()
-logger.addHandler(console_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    # Формат вывода
+    file_formatter = logging.Formatter(
+        '[%(asctime)s.%(msecs)03d] %(levelname)s: %(message)s',
+        datefmt='%H:%M:%S'
+    )
+
+    # Обработчик для файла
+    file_handler = FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(file_formatter)
+    logger.addHandler(file_handler)
+
+    # Обработчик для консоли
+    console_handler = StreamHandler()
+    logger.addHandler(console_handler)
+
+class TickerLog:
+    """
+    Буфер сообщений по одному тикеру: при параллельной обработке строки тикера выводятся одним блоком.
+    Записи создаются сразу, поэтому в логе остается время самого события, а не время вывода.
+    """
+    def __init__(self):
+        self.records = []
+
+    def info(self, msg: str, *args):
+        if logger.isEnabledFor(logging.INFO):
+            self.records.append(logger.makeRecord(logger.name, logging.INFO, __file__, 0, msg, args, None))
+
+    def flush(self):
+        logger.info(SEPARATOR)
+        for record in self.records:
+            logger.handle(record)
+        self.records.clear()
 # ==============================
 
+# === Справочник инструментов ===
+@dataclass
+class InstrumentCatalog:
+    """
+    Справочник инструментов из SHARES (акции, ETF, облигации), загружаемый один раз за сессию.
+    """
+    instruments: list
+    by_ticker: dict = field(init=False)
+    by_figi: dict = field(init=False)
+
+    def __post_init__(self):
+        self.by_ticker = {instr.ticker: instr for instr in self.instruments}
+        self.by_figi = {instr.figi: instr for instr in self.instruments if isinstance(instr, Bond)}
+
+# === Ограничение частоты заявок ===
+class TokenBucket:
+    """
+    Ограничитель частоты запросов: в среднем не более rate запросов в секунду, подряд — не более burst.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = None  # Создается в acquire(), чтобы привязаться к циклу, запущенному asyncio.run()
+
+    async def acquire(self):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+order_rate_limiter = TokenBucket(ORDER_RATE_LIMIT, ORDER_BURST)
+
 # === Функции работы с API ===
-def money_value_to_float(money: MoneyValue) -> float:
+@lru_cache(maxsize=1024)
+def money_value_to_float(units: int, nano: int) -> float:
+    """
+    Конвертирует MoneyValue/Quotation (units, nano) в float, округляя до копеек.
+    """
+    return round(units + nano / 1e9, 2)
+
+def float_to_money_value(value: float) -> MoneyValue:
+    """
+    Конвертирует float в MoneyValue без потери точности (10.1 -> units=10, nano=100000000).
+    """
+    amount = Decimal(str(value))
+    units = int(amount)
+    return MoneyValue(units=units, nano=int((amount - units) * 1_000_000_000))
+
+def generate_order_ids(count: int) -> list:
+    """
+    Генерирует count идентификаторов заявок (UUID4) за одно обращение к os.urandom.
+    """
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(count)]
+
+def format_price(value: float) -> str:
     """
-    Конвертирует MoneyValue в float.
+    Форматирует сумму с двумя знаками после запятой: 1234.5 -> "1234,50".
     """
-    return round(money.units + money.nano / 1e9, 2)
+    return format(value, ".2f").translate(_DOT_TO_COMMA)
 
-def get_account_id(client: Client) -> str:
-    accounts = client.users.get_accounts().accounts
+async def get_account_id(client: AsyncServices) -> str:
+    accounts = (await client.users.get_accounts()).accounts
     if not accounts:
         raise RuntimeError("🚨 Нет доступных счетов!")
     
     if len(accounts) == 1:
-        logger.info(f"📌 Найден единственный счет: {accounts[0].name} ({accounts[0].id})")
+        logger.info("📌 Найден единственный счет: %s (%s)", accounts[0].name, accounts[0].id)
         return accounts[0].id
 
     logger.info("📋 Доступные счета:")
     for idx, account in enumerate(accounts, 1):
-        logger.info(f"{idx}. {account.name} (ID: {account.id})")
+        logger.info("%d. %s (ID: %s)", idx, account.name, account.id)
     
     while True:
         try:
             choice = int(input(f"Введите номер счета (1-{len(accounts)}): "))
             if 1 <= choice <= len(accounts):
                 selected_account = accounts[choice - 1]
-                logger.info(f"✅ Выбран счет: {selected_account.name} (ID: {selected_account.id})")
+                logger.info("✅ Выбран счет: %s (ID: %s)", selected_account.name, selected_account.id)
                 return selected_account.id
             else:
                 logger.info("⚠️ Неверный выбор, попробуйте снова.")
         except ValueError:
             logger.info("⚠️ Введите числовое значение.")
 
-def get_figi(client: Client, ticker: str) -> str:
+async def find_instrument(client: AsyncServices, ticker: str):
+    """
+    Находит инструмент по тикеру через серверный поиск и загружает его описание.
+    Для облигаций загружается полное описание Bond (с номиналом).
+    Если тикер совпадает у нескольких инструментов, приоритет у акций, затем ETF, затем облигаций.
+    """
+    response = await client.instruments.find_instrument(query=ticker)
+    candidates = [
+        instr for instr in response.instruments
+        if instr.ticker == ticker and instr.api_trade_available_flag and instr.instrument_type in INSTRUMENT_TYPES
+    ]
+    if not candidates:
+        return None
+    found = min(candidates, key=lambda instr: INSTRUMENT_TYPES.index(instr.instrument_type))
+    if found.instrument_type == "bond":
+        return (await client.instruments.bond_by(
+            id_type=InstrumentIdType.INSTRUMENT_ID_TYPE_FIGI, id=found.figi
+        )).instrument
+    return (await client.instruments.get_instrument_by(
+        id_type=InstrumentIdType.INSTRUMENT_ID_TYPE_FIGI, id=found.figi
+    )).instrument
+
+async def load_catalog(client: AsyncServices, tickers: list) -> InstrumentCatalog:
+    """
+    Параллельно загружает описания инструментов для указанных тикеров.
+    Тикер, для которого поиск завершился ошибкой, пропускается.
+    """
+    results = await asyncio.gather(
+        *[find_instrument(client, ticker) for ticker in tickers],
+        return_exceptions=True,
+    )
+    instruments = []
+    for ticker, result in zip(tickers, results):
+        if isinstance(result, Exception):
+            logger.info("❌ Ошибка при поиске %s: %s", ticker, result)
+        elif result:
+            instruments.append(result)
+    return InstrumentCatalog(instruments=instruments)
+
+def get_figi(catalog: InstrumentCatalog, ticker: str) -> str:
     """
     Получает FIGI инструмента по его тикеру.
     """
-    for method in [client.instruments.shares, client.instruments.etfs, client.instruments.bonds]:
-        instruments = method().instruments
-        figi = next((instr.figi for instr in instruments if instr.ticker == ticker), None)
-        if figi:
-            return figi
+    instrument = catalog.by_ticker.get(ticker)
+    if instrument:
+        return instrument.figi
     raise ValueError(f"❌ Тикер {ticker} не найден!")
 
-def get_share_price(client: Client, figi: str) -> float:
+async def get_last_prices(client: AsyncServices, figis: list) -> dict:
     """
-    Получает текущую рыночную цену инструмента по его FIGI.
+    Получает последние цены сразу для всех FIGI одним запросом.
     """
-    orderbook = client.market_data.get_order_book(figi=figi, depth=1)
-    instruments = client.instruments.bonds()
-    bond = next((b for b in instruments.instruments if b.figi == figi), None)
-    if bond:
-        price_percent = money_value_to_float(orderbook.last_price)
-        nominal_value = money_value_to_float(bond.nominal)
-        return round((price_percent * nominal_value) / 100, 2)
-    return round(money_value_to_float(orderbook.last_price), 2)
+    response = await client.market_data.get_last_prices(figi=figis)
+    return {last_price.figi: last_price.price for last_price in response.last_prices}
 
-def get_lot_size(client: Client, ticker: str) -> int:
+def price_from_last(last_price, instrument=None) -> float:
+    """
+    Переводит последнюю цену инструмента в рубли за бумагу.
+    Для облигаций (instrument типа Bond) цена задана в процентах от номинала.
+    """
+    if last_price is None:
+        raise ValueError("⚠️ Текущая цена не найдена!")
+    price = money_value_to_float(last_price.units, last_price.nano)
+    if isinstance(instrument, Bond):
+        nominal = instrument.nominal
+        return round(price * money_value_to_float(nominal.units, nominal.nano) / 100, 2)
+    return price
+
+def get_lot_size(catalog: InstrumentCatalog, ticker: str) -> int:
     """
     Получает размер лота инструмента по тикеру.
     """
-    for method in [client.instruments.shares, client.instruments.etfs, client.instruments.bonds]:
-        instruments = method().instruments
-        lot_size = next((instr.lot for instr in instruments if instr.ticker == ticker), None)
-        if lot_size:
-            return lot_size
+    instrument = catalog.by_ticker.get(ticker)
+    if instrument and instrument.lot:
+        return instrument.lot
     raise ValueError(f"⚠️ Лот для {ticker} не найден!")
 
-def place_limit_order(client: Client, account_id: str, figi: str, money_amount: float, ticker: str, params: dict):
+async def place_limit_order(client: AsyncServices, catalog: InstrumentCatalog, last_prices: dict, account_id: str, order_id: str, figi: str, money_amount: float, ticker: str, params: dict, log: TickerLog):
     """
     Выставляет лимитную заявку на покупку.
     """
-    price = get_share_price(client, figi)
-    lot_size = get_lot_size(client, ticker)
+    price = price_from_last(last_prices.get(figi), catalog.by_figi.get(figi))
+    lot_size = get_lot_size(catalog, ticker)
     
     discount = params.get("discount", DEFAULT_DISCOUNT)
     discount_price = params.get("discount_price")
 
     if discount_price:
         limit_price = discount_price
-        discount_text = f"Используется фиксированная цена: {str(discount_price).replace('.', ',')} руб."
+        discount_text = f"Используется фиксированная цена: {format_price(discount_price)} руб."
     else:
         limit_price = round(price * (1 - discount / 100), 2)
         discount_text = f"Скидка: {discount}%"
@@ -151,53 +290,65 @@ def place_limit_order(client: Client, account_id: str, figi: str, money_amount:
     
     if lots > 0:
         planned_total_cost = lots * lot_size * limit_price
-        logger.info(f"🔍 Планируется выставить заявку на покупку:")
-        logger.info(f"  Тикер: {ticker}")
-        logger.info(f"  Количество бумаг: {lots * lot_size}")
-        logger.info(f"  Цена за бумагу: {str(limit_price).replace('.', ',')} руб.")
-        logger.info(f"  Общая сумма заявки: {str(planned_total_cost).replace('.', ',')} руб.")
-        logger.info(f"  Текущая цена: {str(price).replace('.', ',')} руб.")
-        logger.info(f"  {discount_text}")
-
-        order_id = str(uuid.uuid4())
-        client.orders.post_order(
+        log.info(
+            "🔍 Планируется выставить заявку на покупку:\n"
+            "  Тикер: %s\n"
+            "  Количество бумаг: %d\n"
+            "  Цена за бумагу: %s руб.\n"
+            "  Общая сумма заявки: %s руб.\n"
+            "  Текущая цена: %s руб.\n"
+            "  %s",
+            ticker, lots * lot_size, format_price(limit_price), format_price(planned_total_cost),
+            format_price(price), discount_text,
+        )
+
+        await order_rate_limiter.acquire()
+        await client.orders.post_order(
             figi=figi,
             quantity=lots,
             account_id=account_id,
             direction=OrderDirection.ORDER_DIRECTION_BUY,
             order_type=OrderType.ORDER_TYPE_LIMIT,
             order_id=order_id,
-            price=MoneyValue(units=int(limit_price), nano=int((limit_price % 1) * 1e9)),
+            price=float_to_money_value(limit_price),
         )
 
-        logger.info(f"✅ Заявка на {lots * lot_size} бумаг {ticker} по {str(limit_price).replace('.', ',')} руб. выставлена. "
-              f"(Текущая цена: {str(price).replace('.', ',')} руб.). Сумма: {str(lots * lot_size * limit_price).replace('.', ',')} руб.")
+        log.info("✅ Заявка на %d бумаг %s по %s руб. выставлена. (Текущая цена: %s руб.). Сумма: %s руб.",
+                 lots * lot_size, ticker, format_price(limit_price), format_price(price), format_price(planned_total_cost))
 
     else:
-        logger.info(f"❌ Недостаточно средств для заявки {ticker}")
+        log.info("❌ Недостаточно средств для заявки %s", ticker)
+
+async def cancel_orders(client: AsyncServices, account_id: str):
+    orders = (await client.orders.get_orders(account_id=account_id)).orders
 
-def cancel_orders(client: Client, account_id: str):
-    orders = client.orders.get_orders(account_id=account_id).orders
-    for order in orders:
+    async def cancel(order_id: str):
+        await order_rate_limiter.acquire()
+        await client.orders.cancel_order(account_id=account_id, order_id=order_id)
+
+    results = await asyncio.gather(
+        *[cancel(order.order_id) for order in orders],
+        return_exceptions=True,
+    )
+    for order, result in zip(orders, results):
         logger.info(SEPARATOR)
-        try:
-            client.orders.cancel_order(account_id=account_id, order_id=order.order_id)
-            logger.info(f"🛑 Отменена заявка {order.order_id}")
-        except Exception as e:
-            logger.info(f"⚠️ Не удалось отменить заявку {order.order_id}: {e}")
+        if isinstance(result, Exception):
+            logger.info("⚠️ Не удалось отменить заявку %s: %s", order.order_id, result)
+        else:
+            logger.info("🛑 Отменена заявка %s", order.order_id)
 
-def buy_share(client: Client, account_id: str, figi: str, money_amount: float, ticker: str):
+async def buy_share(client: AsyncServices, catalog: InstrumentCatalog, last_prices: dict, account_id: str, order_id: str, figi: str, money_amount: float, ticker: str, log: TickerLog):
     """
     Совершает рыночную покупку инструмента и сразу получает реальную цену,
-    если она доступна в ответе post_order(). В противном случае ждет обновления портфеля.
+    если она доступна в ответе post_order(). В противном случае запрашивает состояние заявки.
     """
-    lot_size = get_lot_size(client, ticker)
-    price = get_share_price(client, figi)
+    lot_size = get_lot_size(catalog, ticker)
+    price = price_from_last(last_prices.get(figi), catalog.by_figi.get(figi))
     lots = int(money_amount // (price * lot_size))
 
     if lots > 0:
-        order_id = str(uuid.uuid4())
-        order_response = client.orders.post_order(
+        await order_rate_limiter.acquire()
+        order_response = await client.orders.post_order(
             figi=figi,
             quantity=lots,
             account_id=account_id,
@@ -207,38 +358,75 @@ def buy_share(client: Client, account_id: str, figi: str, money_amount: float, t
         )
 
         total_price = lots * lot_size * price
-        logger.info(f"✅ Заявка на {lots * lot_size} бумаг {ticker} по {str(price).replace('.', ',')} руб. выставлена. "
-              f"(Текущая цена: {str(price).replace('.', ',')} руб.). Сумма: {str(total_price).replace('.', ',')} руб.")
+        log.info("✅ Заявка на %d бумаг %s по %s руб. выставлена. (Текущая цена: %s руб.). Сумма: %s руб.",
+                 lots * lot_size, ticker, format_price(price), format_price(price), format_price(total_price))
 
 
         real_price = None
-        if order_response.executed_order_price:
-            real_price = money_value_to_float(order_response.executed_order_price)
-            logger.info(f"💰 Фактическая цена покупки {ticker}: {str(real_price).replace('.', ',')} руб.")
+        executed_price = order_response.executed_order_price
+        if executed_price.units or executed_price.nano:
+            real_price = money_value_to_float(executed_price.units, executed_price.nano)
+            log.info("💰 Фактическая цена покупки %s: %s руб.", ticker, format_price(real_price))
             return
 
-        for attempt in range(5):
-            time.sleep(1)
-            
-            positions = client.operations.get_portfolio(account_id=account_id).positions
-            for position in positions:
-                if position.figi == figi and position.average_position_price:
-                    real_price = money_value_to_float(position.average_position_price)
-                    break
+        delay = PRICE_POLL_INITIAL_DELAY
+        for attempt in range(PRICE_POLL_ATTEMPTS):
+            await asyncio.sleep(delay)
+            delay *= 2
 
-            if real_price:
+            try:
+                state = await client.orders.get_order_state(account_id=account_id, order_id=order_response.order_id)
+            except AioRequestError as e:
+                log.info("⚠️ Не удалось получить состояние заявки %s: %s", ticker, e)
+                continue
+
+            average_price = state.average_position_price
+            if average_price.units or average_price.nano:
+                real_price = money_value_to_float(average_price.units, average_price.nano)
                 break
 
         if real_price:
-            logger.info(f"💰 Фактическая цена покупки {ticker}: {real_price:.2f} руб.")
+            log.info("💰 Фактическая цена покупки %s: %s руб.", ticker, format_price(real_price))
         else:
-            logger.info(f"⚠️ Не удалось получить фактическую цену покупки {ticker}, API не успел обновить данные.")
+            log.info("⚠️ Не удалось получить фактическую цену покупки %s, API не успел обновить данные.", ticker)
     else:
-        logger.info(f"❌ Недостаточно средств для покупки {ticker}")
+        log.info("❌ Недостаточно средств для покупки %s", ticker)
+
+
+def build_figi_map(catalog: InstrumentCatalog) -> dict:
+    """
+    Сопоставляет тикеры из SHARES с их FIGI. Ненайденные тикеры пропускаются.
+    """
+    figi_map = {}
+    for ticker in SHARES:
+        try:
+            figi_map[ticker] = get_figi(catalog, ticker)
+        except ValueError as e:
+            logger.info("%s", e)
+    return figi_map
+
+async def run_for_shares(process, figi_map: dict, error_text: str):
+    """
+    Параллельно выполняет корутину process(ticker, figi, params, log) для всех найденных инструментов.
+    Сообщения каждого тикера выводятся одним блоком после завершения всех задач.
+    """
+    logs = {ticker: TickerLog() for ticker in figi_map}
+    try:
+        results = await asyncio.gather(
+            *[process(ticker, figi, SHARES[ticker], logs[ticker]) for ticker, figi in figi_map.items()],
+            return_exceptions=True,
+        )
+        for ticker, result in zip(figi_map, results):
+            if isinstance(result, Exception):
+                logs[ticker].info("%s %s: %s", error_text, ticker, result)
+    finally:
+        # Выводим накопленное даже при прерывании (Ctrl+C), чтобы не потерять записи о выставленных заявках
+        for log in logs.values():
+            log.flush()
 
 
 # === Основная функция ===
-def main():
+async def main():
     parser = argparse.ArgumentParser(description="Скрипт для торговли на Tinkoff API.", formatter_class=argparse.RawTextHelpFormatter)
     parser.add_argument("-m", "--mode", type=int, choices=[1, 2, 3],
                         help="Режим работы:\n"
@@ -246,6 +434,7 @@ def main():
                              "2 - Отмена всех заявок\n"
                              "3 - Покупка по рынку")
     args = parser.parse_args()
+    configure_logging()
 
     logger.info(
         r"""
@@ -278,32 +467,41 @@ def main():
             except ValueError:
                 logger.info("⚠️ Введите числовое значение.")
 
-    with Client(TOKEN) as client:
-        account_id = get_account_id(client)
+    async with AsyncClient(TOKEN) as client:
+        account_id = await get_account_id(client)
+
+        if mode in (1, 3):
+            catalog = await load_catalog(client, list(SHARES))
+            figi_map = build_figi_map(catalog)
+            if not figi_map:
+                logger.info("❌ Ни один тикер из списка не найден.")
+                return
+            try:
+                last_prices = await get_last_prices(client, list(figi_map.values()))
+            except Exception as e:
+                logger.info("❌ Не удалось получить текущие цены: %s", e)
+                return
+            order_ids = dict(zip(figi_map, generate_order_ids(len(figi_map))))
 
         if mode == 1:
             logger.info("\n🚀 --- Выставление заявок ---")
-            for ticker, params in SHARES.items():
-                logger.info(SEPARATOR)
-                try:
-                    figi = get_figi(client, ticker)
-                    place_limit_order(client, account_id, figi, params["amount"], ticker, params)
-                except Exception as e:
-                    logger.info(f"❌ Ошибка при обработке {ticker}: {e}")
+
+            async def process(ticker: str, figi: str, params: dict, log: TickerLog):
+                await place_limit_order(client, catalog, last_prices, account_id, order_ids[ticker], figi, params["amount"], ticker, params, log)
+
+            await run_for_shares(process, figi_map, "❌ Ошибка при обработке")
 
         elif mode == 2:
             logger.info("\n⛔ --- Отмена всех заявок ---")
-            cancel_orders(client, account_id)
+            await cancel_orders(client, account_id)
 
         elif mode == 3:
             logger.info("\n💸 --- Покупка по рынку ---")
-            for ticker, params in SHARES.items():
-                logger.info(SEPARATOR)
-                try:
-                    figi = get_figi(client, ticker)
-                    buy_share(client, account_id, figi, params["amount"], ticker)
-                except Exception as e:
-                    logger.info(f"❌ Ошибка при покупке {ticker}: {e}")
+
+            async def process(ticker: str, figi: str, params: dict, log: TickerLog):
+                await buy_share(client, catalog, last_prices, account_id, order_ids[ticker], figi, params["amount"], ticker, log)
+
+            await run_for_shares(process, figi_map, "❌ Ошибка при покупке")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())